@@ -6,6 +6,7 @@ totals to values.csv and accounts.csv (overwriting same-day rows on re-runs),
 and writes top items to items.json.
 
 Requires: pip install requests
+Optional: pip install orjson (faster decoding of large inventory responses)
 """
 import csv
 import datetime as dt
@@ -14,12 +15,21 @@ import json
 import os
 import random
 import re
+import threading
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 from urllib.parse import quote
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # ---------------------------------------------------------------------------
 # Config
@@ -32,9 +42,13 @@ STEAM_IDS      = CONFIG.get("steam_ids", [])
 CURRENCY       = CONFIG.get("currency", "EUR").upper()
 ACCOUNT_LABELS = CONFIG.get("account_labels", {})
 SLEEP_MS       = int(CONFIG.get("sleep_between_price_requests_ms", 4000))
+PRICE_WORKERS  = max(1, int(CONFIG.get("price_request_workers", 4)))
+PRICE_BURST    = max(1, int(CONFIG.get("price_request_burst", 3)))
 DEBUG          = CONFIG.get("debug", True)
 TOP_ITEMS      = int(CONFIG.get("top_items_count", 25))
 PRICE_TTL_HRS  = float(CONFIG.get("price_cache_ttl_hours", 12))
+LOW_VALUE_PRICE   = float(CONFIG.get("low_value_price_threshold", 0.05))
+LOW_VALUE_TTL_HRS = float(CONFIG.get("low_value_cache_ttl_hours", 168))
 HISTORY_SLEEP_MIN_MS = int(CONFIG.get("history_sleep_min_ms", max(SLEEP_MS, 12000)))
 HISTORY_SLEEP_MAX_MS = int(CONFIG.get("history_sleep_max_ms", max(SLEEP_MS * 3, 30000)))
 
@@ -57,11 +71,33 @@ HISTORY_CACHE = ROOT / "item_history_cache.json"
 BACKTRACK_CSV = ROOT / "backtracked_values.csv"
 ITEM_SNAPSHOTS_CSV = ROOT / "item_snapshots.csv"
 
+# accounts.csv keeps its historical "value_eur" column for every currency;
+# the currency column says what the value is in.
+ACCOUNT_VALUE_COL = "value_eur"
+VALUES_FIELDS     = ["date", "lowest", "median", "currency"]
+ACCOUNTS_FIELDS   = ["date", "steam_id", ACCOUNT_VALUE_COL, "currency"]
+BACKTRACK_FIELDS  = [
+    "date", "value", "coverage_items", "coverage_qty", "tracked_items", "volume", "currency",
+]
+ITEM_SNAPSHOT_FIELDS = [
+    "date", "account_id", "account_label", "name", "qty",
+    "lowest", "median", "total_lowest", "total_median",
+    "type", "exterior", "rarity", "quality", "family",
+    "market_url", "currency",
+]
+
 SESSION = requests.Session()
 SESSION.headers.update({
     "User-Agent": "Mozilla/5.0 inventory-value-tracker/1.0",
     "Accept": "application/json,text/javascript,*/*;q=0.01",
 })
+# Keep enough pooled keep-alive connections for the price worker pool and the
+# per-account inventory threads so connections are reused instead of
+# discarded. Retries stay in get_with_retry, which honours Retry-After.
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=max(16, PRICE_WORKERS, len(STEAM_IDS)),
+))
 
 if os.environ.get("STEAM_SESSIONID"):
     SESSION.cookies.set("sessionid", os.environ["STEAM_SESSIONID"], domain="steamcommunity.com")
@@ -80,6 +116,8 @@ try:
     PRICE_CACHE_DATA = json.loads(PRICE_CACHE.read_text(encoding="utf-8"))
 except (FileNotFoundError, json.JSONDecodeError):
     PRICE_CACHE_DATA = {}
+PRICE_CACHE_LOCK = threading.Lock()
+PRICE_CACHE_SAVE_EVERY = 50
 
 try:
     HISTORY_CACHE_DATA = json.loads(HISTORY_CACHE.read_text(encoding="utf-8"))
@@ -95,6 +133,13 @@ def dbg(msg: str) -> None:
         print(f"[DEBUG] {msg}")
 
 
+def response_json(r: requests.Response):
+    """Decode a JSON response body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(r.content)
+    return r.json()
+
+
 def history_sleep_seconds() -> float:
     low = max(0, min(HISTORY_SLEEP_MIN_MS, HISTORY_SLEEP_MAX_MS))
     high = max(low, max(HISTORY_SLEEP_MIN_MS, HISTORY_SLEEP_MAX_MS))
@@ -138,30 +183,47 @@ def cache_key(name: str) -> str:
     return f"{CURRENCY_CODE}:{name}"
 
 
+def price_ttl_seconds(lowest: Optional[float], median: Optional[float]) -> float:
+    """
+    Items worth less than low_value_price_threshold (graffiti, cheap cases,
+    souvenir trash) barely move the total, so they are re-priced less often.
+    """
+    known = [p for p in (lowest, median) if p is not None]
+    if known and max(known) < LOW_VALUE_PRICE:
+        return LOW_VALUE_TTL_HRS * 3600
+    return PRICE_TTL_HRS * 3600
+
+
 def get_cached_price(name: str) -> Optional[tuple]:
     entry = PRICE_CACHE_DATA.get(cache_key(name))
     if not isinstance(entry, dict):
         return None
+    lowest, median = entry.get("lowest"), entry.get("median")
     fetched_at = float(entry.get("fetched_at", 0) or 0)
-    if fetched_at <= 0 or (now_ts() - fetched_at) > PRICE_TTL_HRS * 3600:
+    if fetched_at <= 0 or (now_ts() - fetched_at) > price_ttl_seconds(lowest, median):
         return None
-    return entry.get("lowest"), entry.get("median")
+    return lowest, median
 
 
 def set_cached_price(name: str, lowest: Optional[float], median: Optional[float]) -> None:
-    PRICE_CACHE_DATA[cache_key(name)] = {
-        "currency": CURRENCY,
-        "lowest": lowest,
-        "median": median,
-        "fetched_at": now_ts(),
-    }
+    with PRICE_CACHE_LOCK:
+        PRICE_CACHE_DATA[cache_key(name)] = {
+            "currency": CURRENCY,
+            "lowest": lowest,
+            "median": median,
+            "fetched_at": now_ts(),
+        }
 
 
 def write_price_cache() -> None:
-    PRICE_CACHE.write_text(
-        json.dumps(PRICE_CACHE_DATA, ensure_ascii=False, indent=2, sort_keys=True),
-        encoding="utf-8",
-    )
+    """Atomically write the price cache via a .tmp file, under PRICE_CACHE_LOCK."""
+    with PRICE_CACHE_LOCK:
+        tmp = PRICE_CACHE.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps(PRICE_CACHE_DATA, ensure_ascii=False, indent=2, sort_keys=True),
+            encoding="utf-8",
+        )
+        tmp.replace(PRICE_CACHE)
 
 
 def write_history_cache() -> None:
@@ -317,17 +379,28 @@ def read_csv_dicts(path: Path):
 def write_csv_dicts(path: Path, fieldnames: list, rows: list) -> None:
     """Atomically write CSV by staging to a .tmp file first."""
     tmp = path.with_suffix(".tmp")
-    with open(tmp, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        w.writerows(rows)
+    with open(tmp, "w", newline="", encoding="utf-8", buffering=1 << 16) as f:
+        # Project rows up front and hand them to the C writer in one call;
+        # DictWriter re-validates every row's keys in Python.
+        w = csv.writer(f)
+        w.writerow(fieldnames)
+        w.writerows([[r.get(k, "") for k in fieldnames] for r in rows])
     tmp.replace(path)  # atomic on POSIX; best-effort on Windows
 
 
-def upsert_rows(path: Path, fieldnames: list, new_rows: list, key_fields: list) -> None:
+def upsert_rows(
+    path: Path,
+    fieldnames: list,
+    new_rows: list,
+    key_fields: list,
+    backfill_fields: tuple[str, ...] = (),
+) -> None:
     """
     Write new_rows into path, overwriting any existing rows whose key_fields
     match. New rows are appended at the end. Safe to call multiple times per day.
+
+    If backfill_fields is given, daily gaps are interpolated for those columns
+    before the single write (see fill_missing_daily_rows).
     """
     existing_fields, existing = read_csv_dicts(path)
     # Always include every required fieldname; existing columns keep their order.
@@ -335,20 +408,29 @@ def upsert_rows(path: Path, fieldnames: list, new_rows: list, key_fields: list)
     new_keys = {tuple(r[k] for k in key_fields) for r in new_rows}
     kept = [r for r in existing
             if tuple(r.get(k, "") for k in key_fields) not in new_keys]
-    write_csv_dicts(path, all_fields, kept + new_rows)
-
-
-def backfill_missing_daily_rows(path: Path, numeric_fields: tuple[str, ...]) -> None:
+    rows = kept + new_rows
+    if backfill_fields:
+        all_fields, rows, added = fill_missing_daily_rows(all_fields, rows, backfill_fields)
+        if added:
+            dbg(f"Backfilled {added} missing daily row(s) in {path.name}")
+    write_csv_dicts(path, all_fields, rows)
+
+
+def fill_missing_daily_rows(
+    fieldnames: list,
+    rows: list,
+    numeric_fields: tuple[str, ...],
+) -> tuple[list, list, int]:
     """
     Fill date gaps by linear interpolation between neighboring real rows.
 
     This is only used for display continuity after skipped workflow days. It does
     not invent future values and only fills dates that are bracketed by existing
-    earlier and later rows.
+    earlier and later rows. Returns (fieldnames, rows, added); the input is
+    returned unchanged when there is nothing to fill.
     """
-    fieldnames, rows = read_csv_dicts(path)
     if not rows or "date" not in fieldnames:
-        return
+        return fieldnames, rows, 0
 
     by_date = {}
     for row in rows:
@@ -365,7 +447,7 @@ def backfill_missing_daily_rows(path: Path, numeric_fields: tuple[str, ...]) ->
 
     dated_rows.sort(key=lambda pair: pair[0])
     if len(dated_rows) < 2:
-        return
+        return fieldnames, rows, 0
 
     out = []
     added = 0
@@ -399,14 +481,71 @@ def backfill_missing_daily_rows(path: Path, numeric_fields: tuple[str, ...]) ->
 
     out.append(dated_rows[-1][1])
 
-    if added:
-        write_csv_dicts(path, all_fields, out)
-        dbg(f"Backfilled {added} missing daily row(s) in {path.name}")
+    if not added:
+        return fieldnames, rows, 0
+    return all_fields, out, added
 
 # ---------------------------------------------------------------------------
 # HTTP with exponential backoff retry
 # ---------------------------------------------------------------------------
 
+class RequestThrottle:
+    """
+    Token bucket shared by every request thread.
+
+    Tokens refill at one per `interval` seconds up to `burst`, so short bursts
+    go out immediately and callers only sleep once the bucket is empty. The
+    wait overlaps with requests still in flight, so round-trip time does not
+    add to the interval.
+    """
+
+    def __init__(self, interval: float, burst: int = 1) -> None:
+        self.rate = 1.0 / interval if interval > 0 else 0.0
+        self.burst = max(1, burst)
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._hold_until = 0.0
+        self._holds = 0
+
+    def wait(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                holds = self._holds
+                start = max(now, self._hold_until)
+                if self.rate:
+                    # _last sits in the future while a hold is active; no
+                    # tokens refill until it ends.
+                    elapsed = max(0.0, now - self._last)
+                    self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+                    self._last = max(self._last, now)
+                    # Tokens may go negative: later callers queue behind earlier ones.
+                    self._tokens -= 1
+                    if self._tokens < 0:
+                        start = max(start, self._last - self._tokens / self.rate)
+            if start > now:
+                time.sleep(start - now)
+            with self._lock:
+                # A hold issued while we slept voids our slot; queue again.
+                if self._holds == holds:
+                    return
+
+    def defer(self, seconds: float) -> None:
+        """Hold back every waiting thread, e.g. after Steam answered 429."""
+        with self._lock:
+            self._hold_until = max(self._hold_until, time.monotonic() + seconds)
+            self._holds += 1
+            # Empty the bucket and restart the refill when the hold ends, so
+            # the hold does not end in a burst. Waiters re-queue after a hold,
+            # so earlier reservations are dropped, and overlapping holds do not stack.
+            self._tokens = 0.0
+            self._last = self._hold_until
+
+
+PRICE_THROTTLE = RequestThrottle(SLEEP_MS / 1000.0, PRICE_BURST)
+
+
 def get_with_retry(
     url: str,
     params: Optional[dict] = None,
@@ -414,9 +553,14 @@ def get_with_retry(
     base_delay: float = 2.0,
     max_delay: float = 90.0,
     timeout: int = 30,
+    throttle: Optional[RequestThrottle] = None,
 ) -> requests.Response:
     for attempt in range(max_retries):
         try:
+            # Retries go through the throttle too, so workers released from
+            # a 429 hold queue up instead of all firing at once.
+            if throttle is not None:
+                throttle.wait()
             r = SESSION.get(url, params=params, timeout=timeout)
             if r.status_code == 429:
                 retry_after = r.headers.get("Retry-After")
@@ -430,7 +574,11 @@ def get_with_retry(
                 wait = min(wait, max_delay) + random.uniform(0, 1.5)
                 dbg(f"429 rate-limited → waiting {wait:.0f}s "
                     f"(attempt {attempt + 1}/{max_retries})")
-                time.sleep(wait)
+                if throttle is not None:
+                    # Hold every worker sharing this throttle, not just us.
+                    throttle.defer(wait)
+                else:
+                    time.sleep(wait)
                 continue
             r.raise_for_status()
             return r
@@ -446,13 +594,24 @@ def get_with_retry(
 # Steam inventory — paginated
 # ---------------------------------------------------------------------------
 
+# Description fields read by get_marketable_items/describe_item. The rest
+# (text blocks, owner descriptions, fraud warnings) is most of the payload.
+_DESCRIPTION_FIELDS = (
+    "classid", "instanceid", "market_hash_name", "name", "type", "tags",
+    "marketable", "tradable", "commodity", "name_color", "background_color",
+    "icon_url", "icon_url_large", "market_actions", "actions",
+)
+
+
 def fetch_inventory(steam_id: str) -> dict:
     """
     Returns the full CS2 inventory dict, handling Steam's 2000-item
-    pagination automatically.
+    pagination automatically. Descriptions are trimmed to the fields we use,
+    de-duplicated across pages as each page arrives, and returned keyed by
+    (classid, instanceid).
     """
     assets: list = []
-    descriptions: list = []
+    descriptions: dict = {}
     last_assetid: Optional[str] = None
 
     while True:
@@ -464,9 +623,12 @@ def fetch_inventory(steam_id: str) -> dict:
             f"https://steamcommunity.com/inventory/{steam_id}/730/2",
             params=params,
         )
-        data = r.json()
+        data = response_json(r)
         assets.extend(data.get("assets", []))
-        descriptions.extend(data.get("descriptions", []))
+        for d in data.get("descriptions", []):
+            key = (str(d.get("classid")), str(d.get("instanceid", "0")))
+            if key not in descriptions:
+                descriptions[key] = {k: d[k] for k in _DESCRIPTION_FIELDS if k in d}
 
         if not data.get("more_items"):
             break
@@ -482,17 +644,27 @@ def get_marketable_items(inv: dict, steam_id: str) -> dict:
     """
     Returns aggregated marketable item metadata keyed by market_hash_name.
     Non-marketable items (e.g. untradeable skins, event items) are skipped.
+    Expects inv as returned by fetch_inventory, with keyed descriptions.
     """
-    desc_map = {
-        (str(d["classid"]), str(d.get("instanceid", "0"))): d
-        for d in inv.get("descriptions", [])
-    }
-    items: dict = {}
-    skipped = 0
+    desc_map = inv.get("descriptions", {})
+    # Steam occasionally reports an asset instanceid with no matching
+    # description; fall back to any description sharing the classid.
+    classid_map = {classid: d for (classid, _), d in desc_map.items()}
+
+    # Bucket assets by key first so each distinct item is described once,
+    # not once per copy (cases and stickers often come in large stacks).
+    amounts: Counter = Counter()
+    first_asset: dict = {}
     for asset in inv.get("assets", []):
         key = (str(asset["classid"]), str(asset.get("instanceid", "0")))
-        amount = parse_amount(asset.get("amount", 1))
-        desc = desc_map.get(key)
+        amounts[key] += parse_amount(asset.get("amount", 1))
+        first_asset.setdefault(key, asset)
+
+    items: dict = {}
+    skipped = 0
+    for key, amount in amounts.items():
+        asset = first_asset[key]
+        desc = desc_map.get(key) or classid_map.get(key[0])
         if not desc:
             continue
         if not desc.get("marketable", 0):
@@ -515,17 +687,35 @@ def get_marketable_items(inv: dict, steam_id: str) -> dict:
 # ---------------------------------------------------------------------------
 
 _PRICE_RE = re.compile(r"(\d[\d.,]*\d|\d)")
+_SPACE_TABLE = str.maketrans("", "", "\u202f\xa0 ")
+_DIGITS = frozenset("0123456789")
+_PRICE_CHARS = frozenset("0123456789.,")
 
 
 def parse_price(text: str) -> Optional[float]:
     if not text:
         return None
-    # Normalise whitespace variants
-    text = text.replace("\u202f", "").replace("\xa0", "").replace(" ", "")
-    m = _PRICE_RE.search(text)
-    if not m:
-        return None
-    raw = m.group(1)
+    # Normalise whitespace variants in one pass
+    text = text.translate(_SPACE_TABLE)
+    # Steam prices look like "1.234,56€" or "$1,234.56": skip to the first
+    # digit, then take the run of digits and separators. The regex is only
+    # needed for non-ASCII digits.
+    n = len(text)
+    start = 0
+    while start < n and text[start] not in _DIGITS:
+        start += 1
+    if start == n:
+        m = _PRICE_RE.search(text)
+        if not m:
+            return None
+        raw = m.group(1)
+    else:
+        end = start + 1
+        while end < n and text[end] in _PRICE_CHARS:
+            end += 1
+        while text[end - 1] not in _DIGITS:
+            end -= 1
+        raw = text[start:end]
     # Detect European "1.234,56" vs American "1,234.56"
     if "." in raw and "," in raw:
         if raw.rindex(".") < raw.rindex(","):
@@ -563,8 +753,9 @@ def fetch_lowest_from_listing_render(name: str) -> Optional[float]:
             },
             max_retries=3,
             base_delay=3.0,
+            throttle=PRICE_THROTTLE,
         )
-        data = r.json()
+        data = response_json(r)
         listinginfo = data.get("listinginfo", {})
         if not isinstance(listinginfo, dict) or not listinginfo:
             dbg(f"  listings fallback found no active sell listings for '{name}'")
@@ -623,8 +814,9 @@ def fetch_price(name: str) -> tuple:
                 "market_hash_name": name,
                 "currency": CURRENCY_CODE,
             },
+            throttle=PRICE_THROTTLE,
         )
-        data = r.json()
+        data = response_json(r)
         if not data.get("success"):
             dbg(f"  success=false for '{name}'")
             set_cached_price(name, None, None)
@@ -695,7 +887,7 @@ def fetch_market_history(name: str) -> list[dict]:
                     dbg("  Steam pricehistory returned 400 even with supplied cookies. Refresh/copy cookies again.")
             else:
                 hist.raise_for_status()
-                data = hist.json()
+                data = response_json(hist)
                 if isinstance(data, dict) and data.get("success") and isinstance(data.get("prices"), list):
                     raw_points = data["prices"]
                 else:
@@ -784,7 +976,7 @@ def daterange(start: dt.date, end: dt.date):
         cur += dt.timedelta(days=1)
 
 
-def write_backtracked_values(items: list) -> None:
+def write_backtracked_values(today: str, items: list) -> None:
     """
     Write a reconstructed portfolio series for the current holdings.
 
@@ -804,12 +996,12 @@ def write_backtracked_values(items: list) -> None:
         return
 
     first_date = min(dt.date.fromisoformat(h["points"][0]["date"]) for h in histories)
-    today = dt.date.today()
+    last_date = dt.date.fromisoformat(today)
     rows = []
     cursors = [0 for _ in histories]
     latest_prices: list[Optional[float]] = [None for _ in histories]
 
-    for day in daterange(first_date, today):
+    for day in daterange(first_date, last_date):
         day_str = day.isoformat()
         total = 0.0
         coverage_items = 0
@@ -845,7 +1037,7 @@ def write_backtracked_values(items: list) -> None:
 
     write_csv_dicts(
         BACKTRACK_CSV,
-        ["date", "value", "coverage_items", "coverage_qty", "tracked_items", "volume", "currency"],
+        BACKTRACK_FIELDS,
         rows,
     )
 
@@ -885,12 +1077,7 @@ def write_item_snapshots(today: str, items: list) -> None:
     if rows:
         upsert_rows(
             ITEM_SNAPSHOTS_CSV,
-            [
-                "date", "account_id", "account_label", "name", "qty",
-                "lowest", "median", "total_lowest", "total_median",
-                "type", "exterior", "rarity", "quality", "family",
-                "market_url", "currency",
-            ],
+            ITEM_SNAPSHOT_FIELDS,
             rows,
             key_fields=["date", "account_id", "name"],
         )
@@ -899,21 +1086,48 @@ def write_item_snapshots(today: str, items: list) -> None:
 # Core per-account logic
 # ---------------------------------------------------------------------------
 
-def value_for_account(steam_id: str) -> list:
-    """Returns list of item dicts: {name, qty, lowest, median}."""
+def load_account_items(steam_id: str) -> dict:
+    """Returns the account's marketable items keyed by market_hash_name."""
     label = ACCOUNT_LABELS.get(steam_id, steam_id)
     dbg(f"Fetching inventory: {label} ({steam_id})")
 
     inv    = fetch_inventory(steam_id)
     market_items = get_marketable_items(inv, steam_id)
-    total  = len(market_items)
-    dbg(f"  {total} unique marketable items")
+    dbg(f"  {len(market_items)} unique marketable items")
+    return market_items
+
+
+def fetch_prices(names: list) -> dict:
+    """
+    Returns {name: (lowest, median)} for every name.
+
+    Prices are fetched on a small worker pool; PRICE_THROTTLE keeps the overall
+    request rate where the old per-item sleep had it. The cache is saved every
+    PRICE_CACHE_SAVE_EVERY items so interrupted runs keep their progress.
+    """
+    total = len(names)
+    prices: dict = {}
+    with ThreadPoolExecutor(max_workers=PRICE_WORKERS) as pool:
+        for i, (name, (lowest, median)) in enumerate(zip(names, pool.map(fetch_price, names)), 1):
+            prices[name] = (lowest, median)
+
+            lo_s  = f"{lowest:.2f}" if lowest is not None else "N/A"
+            med_s = f"{median:.2f}" if median is not None else "N/A"
+            dbg(f"  [{i}/{total}] {name!r} → L:{lo_s} M:{med_s}")
 
+            if i % PRICE_CACHE_SAVE_EVERY == 0:
+                write_price_cache()
+
+    write_price_cache()
+    return prices
+
+
+def value_for_account(steam_id: str, market_items: dict, prices: dict) -> list:
+    """Returns list of item dicts: {name, qty, lowest, median}."""
+    label = ACCOUNT_LABELS.get(steam_id, steam_id)
     items = []
-    for i, (name, meta) in enumerate(market_items.items(), 1):
-        qty = meta["qty"]
-        cached_before = get_cached_price(name) is not None
-        lowest, median = fetch_price(name)
+    for name, meta in market_items.items():
+        lowest, median = prices.get(name, (None, None))
         items.append({
             **meta,
             "account_id": steam_id,
@@ -921,15 +1135,6 @@ def value_for_account(steam_id: str) -> list:
             "lowest": lowest,
             "median": median,
         })
-
-        lo_s  = f"{lowest:.2f}"       if lowest  is not None else "N/A"
-        med_s = f"{median:.2f}"       if median  is not None else "N/A"
-        tot_s = f"median={median * qty:.2f}" if median is not None else "median=N/A"
-        dbg(f"  [{i}/{total}] {name!r} ×{qty} → L:{lo_s} M:{med_s} {tot_s}")
-
-        if not cached_before:
-            time.sleep(SLEEP_MS / 1000.0)
-
     return items
 
 
@@ -969,14 +1174,31 @@ def main(backfill_history: bool = False) -> None:
     total_lowest: float = 0.0
     total_median: float = 0.0
 
-    for sid in STEAM_IDS:
+    # Accounts are independent, so fetch their inventories side by side.
+    with ThreadPoolExecutor(max_workers=max(1, len(STEAM_IDS))) as pool:
+        futures = [(sid, pool.submit(load_account_items, sid)) for sid in STEAM_IDS]
+
+    account_items: dict = {}
+    for sid, future in futures:
+        try:
+            account_items[sid] = future.result()
+        except Exception as exc:
+            failed_ids.append(sid)
+            print(f"ERROR processing {sid}: {exc}")
+
+    # Price each distinct item once, however many accounts hold it.
+    names = list(dict.fromkeys(name for items in account_items.values() for name in items))
+    dbg(f"Pricing {len(names)} unique item(s) across {len(account_items)} account(s)")
+    prices = fetch_prices(names)
+
+    for sid, market_items in account_items.items():
         try:
-            items = value_for_account(sid)
+            items = value_for_account(sid, market_items, prices)
             all_items.extend(items)
             lo, med = sum_values(items)
             total_lowest += lo
             total_median += med
-            acc_rows.append({"date": today, "steam_id": sid, "value_eur": round(med, 2)})
+            acc_rows.append({"date": today, "steam_id": sid, ACCOUNT_VALUE_COL: round(med, 2)})
             print(f"  {ACCOUNT_LABELS.get(sid, sid)}: "
                   f"median={med} {CURRENCY}, lowest={lo} {CURRENCY}")
         except Exception as exc:
@@ -996,17 +1218,17 @@ def main(backfill_history: bool = False) -> None:
     else:
         upsert_rows(
             VALUES_CSV,
-            ["date", "lowest", "median", "currency"],
+            VALUES_FIELDS,
             [{"date": today, "lowest": total_lowest, "median": total_median, "currency": CURRENCY}],
             key_fields=["date"],
+            backfill_fields=("lowest", "median"),
         )
-        backfill_missing_daily_rows(VALUES_CSV, numeric_fields=("lowest", "median"))
 
     # --- accounts.csv — write only the rows that succeeded ---
     if acc_rows:
         upsert_rows(
             ACCOUNTS_CSV,
-            ["date", "steam_id", "value_eur", "currency"],
+            ACCOUNTS_FIELDS,
             [{**row, "currency": CURRENCY} for row in acc_rows],
             key_fields=["date", "steam_id"],
         )
@@ -1050,7 +1272,7 @@ def main(backfill_history: bool = False) -> None:
     write_item_snapshots(today, all_items)
     if backfill_history:
         backfill_market_history_once(sorted_items)
-    write_backtracked_values(sorted_items)
+    write_backtracked_values(today, sorted_items)
 
     ITEMS_JSON.write_text(
         json.dumps(